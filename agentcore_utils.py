@@ -0,0 +1,132 @@
+"""
+Shared helpers for the AgentCore Runtime test scripts.
+"""
+import codecs
+import functools
+import io
+import sys
+import threading
+import boto3
+import orjson
+from botocore.config import Config
+
+
+@functools.lru_cache(maxsize=None)
+def agentcore_client(region: str = 'us-west-2'):
+    """
+    Return the process-wide bedrock-agentcore client for region.
+
+    boto3 clients are thread-safe, so every script and test thread shares one;
+    the pool is sized above botocore's default of 10 so concurrent invocations
+    don't queue. Throttled calls are retried by botocore's adaptive mode alone.
+    """
+    return boto3.Session().client(
+        'bedrock-agentcore',
+        region_name=region,
+        config=Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'total_max_attempts': 5},
+            connect_timeout=5,
+            read_timeout=120
+        )
+    )
+
+
+def dumps_payload(payload: dict):
+    """Serialize an invoke_agent_runtime payload to JSON bytes."""
+    return orjson.dumps(payload)
+
+
+# Per-thread output buffers so tests running in parallel don't interleave their logs
+_thread_output = threading.local()
+
+
+class ThreadBufferedStdout(io.TextIOBase):
+    """Route writes to the current thread's buffer, if any, else real stdout."""
+
+    def write(self, text):
+        return getattr(_thread_output, "buffer", sys.__stdout__).write(text)
+
+    def flush(self):
+        sys.__stdout__.flush()
+
+
+def run_buffered(fn, *args, **kwargs):
+    """
+    Run fn with its output captured (sys.stdout must be a ThreadBufferedStdout).
+
+    Returns:
+        Tuple of (fn's return value, captured output text)
+    """
+    _thread_output.buffer = io.StringIO()
+    try:
+        result = fn(*args, **kwargs)
+        return result, _thread_output.buffer.getvalue()
+    finally:
+        del _thread_output.buffer
+
+
+def _decode_chunks(body):
+    # Incremental decoder so multi-byte characters split across chunks survive
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    for raw in body.iter_chunks():
+        yield decoder.decode(raw)
+    yield decoder.decode(b'', final=True)
+
+
+def iter_response(body, on_chunk=None):
+    """
+    Yield decoded text from an invoke_agent_runtime response body as it arrives.
+
+    Args:
+        body: botocore StreamingBody (or any object with read()/iter_chunks())
+        on_chunk: Optional callback invoked with each decoded chunk, e.g. to
+            print output while the agent is still responding
+
+    Yields:
+        Decoded text chunks
+    """
+    if hasattr(body, 'iter_chunks'):
+        chunks = _decode_chunks(body)
+    else:
+        chunks = iter([body.read().decode('utf-8', 'replace')])
+
+    for text in chunks:
+        if text:
+            if on_chunk:
+                on_chunk(text)
+            yield text
+
+
+def read_response(response, on_chunk=None):
+    """
+    Read the full text of an invoke_agent_runtime response, streaming chunks to on_chunk.
+
+    Args:
+        response: Dict returned by invoke_agent_runtime; the body is under
+            'response' ('body' is accepted too)
+        on_chunk: Optional callback invoked with each piece of text
+
+    Returns:
+        Response text
+    """
+    body = response.get('response', response.get('body'))
+    if hasattr(body, 'read'):
+        return "".join(iter_response(body, on_chunk))
+
+    if 'output' in response:
+        result = response['output']
+    elif body is not None:
+        result = str(body)
+    else:
+        result = str(response)
+
+    if on_chunk:
+        on_chunk(result)
+    return result
+
+
+def print_chunk(text):
+    """on_chunk callback that writes text to stdout immediately."""
+    print(text, end="", flush=True)
@@ -16,7 +16,7 @@ from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, Tool
 from datetime import datetime
 from typing import Annotated, TypedDict, AsyncGenerator
 import os
-import json
+import orjson
 from browser_tool import get_browser_tool
 from code_interpreter_tool import get_code_interpreter_tool
 from langfuse_config import get_langfuse_handler, update_trace_context, flush_langfuse
@@ -181,9 +181,20 @@ Always explain your results clearly."""
 agent = create_agent()
 
 
+# "event: ...\ndata: " prefixes for every event type the agent emits
+_SSE_PREFIX = {
+    event_type: f"event: {event_type}\ndata: "
+    for event_type in ("AGENT_START", "THINKING", "TOOL_CALL", "TOOL_RESULT", "LLM_RESPONSE", "AGENT_END", "ERROR")
+}
+
+
 def format_sse_event(event_type: str, data: dict) -> str:
     """Format an event as SSE."""
-    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+    payload = orjson.dumps(data).decode()
+    prefix = _SSE_PREFIX.get(event_type)
+    if prefix is None:
+        return f"event: {event_type}\ndata: {payload}\n\n"
+    return prefix + payload + "\n\n"
 
 
 async def stream_agent_async(agent, input_data: dict, config: dict = None, session_id: str = "unknown", callbacks: list = None) -> AsyncGenerator[str, None]:
@@ -114,44 +114,38 @@ def main():
     print("✅ Agent created successfully!")
     print()
     
-    # Example 1: Browse AWS documentation
-    print("-" * 80)
-    print("Example 1: Browsing AWS Documentation")
-    print("-" * 80)
-    
-    prompt1 = """What are the services offered by Bedrock AgentCore? 
+    examples = [
+        (
+            "Example 1: Browsing AWS Documentation",
+            """What are the services offered by Bedrock AgentCore? 
 Use this documentation link: https://docs.aws.amazon.com/bedrock-agentcore/latest/devguide/what-is-bedrock-agentcore.html"""
-    
-    print(f"\n📝 Prompt: {prompt1}\n")
-    print("🌐 Agent is browsing the web...\n")
-    
-    try:
-        response1 = agent.invoke({"messages": [HumanMessage(content=prompt1)]})
-        print("🤖 Agent Response:")
-        print(response1["messages"][-1].content)
-        print()
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        print()
-    
-    # Example 2: Web search and information extraction
-    print("-" * 80)
-    print("Example 2: Information Extraction")
-    print("-" * 80)
-    
-    prompt2 = """Navigate to https://aws.amazon.com/bedrock/ and tell me about 
+        ),
+        (
+            "Example 2: Information Extraction",
+            """Navigate to https://aws.amazon.com/bedrock/ and tell me about 
 the key features of Amazon Bedrock."""
+        ),
+    ]
+    
+    # The examples are independent, so run them concurrently with the graph's
+    # batch API instead of one invoke() after another
+    print(f"🌐 Agent is browsing the web ({len(examples)} examples in parallel)...\n")
+    responses = agent.batch(
+        [{"messages": [HumanMessage(content=prompt)]} for _, prompt in examples],
+        return_exceptions=True
+    )
     
-    print(f"\n📝 Prompt: {prompt2}\n")
-    print("🌐 Agent is browsing the web...\n")
-    
-    try:
-        response2 = agent.invoke({"messages": [HumanMessage(content=prompt2)]})
-        print("🤖 Agent Response:")
-        print(response2["messages"][-1].content)
-        print()
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
+    for (title, prompt), response in zip(examples, responses):
+        print("-" * 80)
+        print(title)
+        print("-" * 80)
+        print(f"\n📝 Prompt: {prompt}\n")
+        
+        if isinstance(response, Exception):
+            print(f"❌ Error: {str(response)}")
+        else:
+            print("🤖 Agent Response:")
+            print(response["messages"][-1].content)
         print()
     
     print("=" * 80)
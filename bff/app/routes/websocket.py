@@ -34,9 +34,10 @@ async def websocket_chat(websocket: WebSocket):
             async for event in client.invoke_stream(
                 prompt=prompt,
                 session_id=session_id,
-                actor_id=actor_id
+                actor_id=actor_id,
+                coalesce=False  # one event per WebSocket message
             ):
-                await websocket.send_text(event)
+                await websocket.send_text(event.decode())
     
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -8,18 +8,169 @@ import aioboto3
 import json
 import logging
 import asyncio
-from typing import AsyncIterator, Optional
+import orjson
+from typing import AsyncIterator, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Events already waiting in the queue are sent together, up to these limits
+STREAM_BATCH_EVENTS = 16
+STREAM_BATCH_BYTES = 8192
+
 
 @dataclass
 class StreamEvent:
     """Streaming event pushed to queue."""
     event_type: str
     data: dict
+    raw: Optional[bytes] = None  # data already serialized as JSON, sent as-is
+
+
+# "event: ...\ndata: " prefixes for the events the BFF sends to clients
+_SSE_PREFIX = {
+    event_type: f"event: {event_type}\ndata: ".encode()
+    for event_type in ("start", "agent_start", "thinking", "tool_start", "tool_end", "message", "error", "done")
+}
+
+
+# Runtime events re-emitted to clients under a new name: (client event, fields
+# clients read with their defaults). Field order matches the runtime's payloads.
+_CLIENT_EVENTS = {
+    "THINKING": ("thinking", {"status": "reasoning", "message": "Thinking..."}),
+    "TOOL_CALL": ("tool_start", {"tool": "unknown", "args": {}}),
+    "TOOL_RESULT": ("tool_end", {"tool": "unknown", "result": ""}),
+}
+
+
+def format_sse_event(event_type: str, data: dict, raw: Optional[bytes] = None) -> bytes:
+    """Format an event for the client SSE stream; raw, if given, is used as the data JSON."""
+    payload = orjson.dumps(data) if raw is None else raw
+    prefix = _SSE_PREFIX.get(event_type)
+    if prefix is None:
+        prefix = f"event: {event_type}\ndata: ".encode()
+    return prefix + payload + b"\n\n"
+
+
+# Canonical (interned) runtime event names. Parsed names are swapped for these so
+# later == checks and dict lookups match on identity, not by comparing characters.
+_EVENT_NAMES = {
+    name: name
+    for name in ("AGENT_START", "THINKING", "TOOL_CALL", "TOOL_RESULT", "LLM_RESPONSE", "AGENT_END", "ERROR")
+}
+
+
+def parse_sse_event(event_str: str, _loads=orjson.loads, _JDE=orjson.JSONDecodeError):
+    """
+    Parse one SSE frame from the agent runtime into (event_type, event_data, data_str).
+    
+    Accepts both the plain event:/data: frame and the form AgentCore wraps it
+    in, data: "<JSON-encoded frame>". data_str is the data JSON text exactly as
+    received, for passing through unchanged. Any value is None if missing.
+    """
+    # Unwrap format: data: "event: ...\ndata: ...\n\n"
+    if event_str.startswith('data: "'):
+        try:
+            event_str = _loads(event_str[6:])
+        except _JDE:
+            return None, None, None
+    
+    event_type = None
+    event_data = None
+    data_str = None
+    
+    # Lines come from format_sse_event unindented, so only values need trimming
+    for line in event_str.split('\n'):
+        field, sep, value = line.partition(':')
+        if not sep:
+            continue
+        if field == 'event':
+            event_type = value.strip()
+            event_type = _EVENT_NAMES.get(event_type, event_type)
+        elif field == 'data':
+            data_str = value.strip()
+            try:
+                event_data = _loads(data_str)
+            except _JDE:
+                event_data = {"raw": data_str}
+                data_str = None
+    
+    return event_type, event_data, data_str
+
+
+class SSEParser:
+    """
+    Incremental SSE parser for the agent runtime stream.
+    
+    feed() takes raw bytes as they arrive and yields parse_sse_event() results
+    for each frame it completes. Bytes are accumulated in a bytearray and only
+    complete frames are decoded, so appends stay constant-time and multi-byte
+    characters split across chunks survive.
+    """
+    
+    __slots__ = ("_buf",)
+    
+    def __init__(self):
+        self._buf = bytearray()
+    
+    def feed(self, chunk: bytes) -> Iterator[Tuple[Optional[str], Optional[dict], Optional[str]]]:
+        buf = self._buf
+        # The carried-over bytes hold no boundary, so only the seam needs rescanning
+        scan = max(len(buf) - 1, 0)
+        buf += chunk
+        start = 0
+        while True:
+            end = buf.find(b"\n\n", scan)
+            if end == -1:
+                break
+            if end > start:
+                yield parse_sse_event(buf[start:end].decode("utf-8", "replace"))
+            start = scan = end + 2
+        del buf[:start]
+    
+    @property
+    def remainder(self) -> str:
+        """Text received after the last complete frame."""
+        return self._buf.decode("utf-8", "replace")
+
+
+def decode_json_string(text: str) -> Optional[str]:
+    """
+    Return text decoded if it is a JSON-encoded string, else None.
+    
+    AgentCore returns plain replies JSON-encoded; only text that starts with a
+    quote is handed to the parser, so ordinary text and SSE frames cost nothing.
+    """
+    text = text.strip()
+    if text[:1] != '"':
+        return None
+    try:
+        decoded = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    return decoded if isinstance(decoded, str) else None
+
+
+def decode_data_frames(text: str) -> Optional[str]:
+    """
+    Return the reply carried by an SSE body of data: "<JSON string>" frames, else None.
+    
+    The runtime entrypoint is an async generator in both modes, so AgentCore
+    frames even a blocking reply this way; the frames' strings are joined.
+    """
+    parts = []
+    # Newlines inside the strings are JSON-escaped, so blank lines only separate frames
+    for frame in text.split("\n\n"):
+        if not frame.strip():
+            continue
+        if not frame.startswith("data:"):
+            return None
+        decoded = decode_json_string(frame[5:])
+        if decoded is None:
+            return None
+        parts.append(decoded)
+    return "".join(parts) if parts else None
 
 
 class StreamingCallbackHandler:
@@ -29,8 +180,8 @@ class StreamingCallbackHandler:
         self.session_id = session_id
         self.queue: asyncio.Queue[Optional[StreamEvent]] = asyncio.Queue()
     
-    async def push_event(self, event_type: str, data: dict) -> None:
-        await self.queue.put(StreamEvent(event_type=event_type, data=data))
+    async def push_event(self, event_type: str, data: dict, raw: Optional[bytes] = None) -> None:
+        await self.queue.put(StreamEvent(event_type=event_type, data=data, raw=raw))
     
     async def get_event(self, timeout: float = 120.0) -> Optional[StreamEvent]:
         try:
@@ -38,6 +189,10 @@ class StreamingCallbackHandler:
         except asyncio.TimeoutError:
             return None
     
+    def get_event_nowait(self) -> Optional[StreamEvent]:
+        """Return an already-queued event; raises asyncio.QueueEmpty if there is none."""
+        return self.queue.get_nowait()
+    
     async def end_streaming(self) -> None:
         await self.queue.put(None)
 
@@ -77,6 +232,14 @@ class AgentClient:
                 result = await streaming_body.read()
                 if isinstance(result, bytes):
                     result = result.decode("utf-8")
+                # AgentCore returns the agent's reply as SSE data frames of JSON
+                # strings (or a bare JSON string); unwrap it once here so clients
+                # receive plain text rather than escaped sequences
+                decoded = decode_data_frames(result)
+                if decoded is None:
+                    decoded = decode_json_string(result)
+                if decoded is not None:
+                    result = decoded
             return result
             return str(response)
     
@@ -115,94 +278,69 @@ class AgentClient:
                 )
                 
                 streaming_body = response.get("response")
-                print(f"🔍 Response keys: {response.keys()}", flush=True)
-                print(f"🔍 Streaming body type: {type(streaming_body)}", flush=True)
                 logger.info(f"Response keys: {response.keys()}")
                 logger.info(f"Streaming body type: {type(streaming_body)}")
                 
                 if streaming_body:
-                    buffer = ""
+                    parser = SSEParser()
                     last_content = ""
                     
-                    # Check if it supports async iteration
-                    print(f"🔍 Has iter_chunks: {hasattr(streaming_body, 'iter_chunks')}", flush=True)
-                    print(f"🔍 Has __aiter__: {hasattr(streaming_body, '__aiter__')}", flush=True)
-                    print(f"🔍 Has read: {hasattr(streaming_body, 'read')}", flush=True)
-                    
                     if hasattr(streaming_body, 'iter_chunks'):
-                        print("✅ Using iter_chunks for streaming", flush=True)
                         logger.info("Using iter_chunks for streaming")
                         chunk_iter = streaming_body.iter_chunks()
                     elif hasattr(streaming_body, '__aiter__'):
-                        print("✅ Using async iteration", flush=True)
                         logger.info("Using async iteration")
                         chunk_iter = streaming_body
                     else:
                         # Fall back to reading the whole response
-                        print("⚠️ No streaming support, reading full response", flush=True)
                         logger.info("No streaming support, reading full response")
                         full_data = await streaming_body.read()
                         if isinstance(full_data, bytes):
                             full_data = full_data.decode("utf-8")
-                        print(f"📦 Full response data: {full_data[:500]}...", flush=True)
-                        logger.info(f"Full response data: {full_data[:500]}...")
+                        logger.debug("Full response data: %.500s...", full_data)
                         
-                        # Try to parse and forward the response
-                        try:
-                            parsed = json.loads(full_data)
-                            if isinstance(parsed, str):
-                                await callback.push_event("message", {
-                                    "content": parsed,
-                                    "final": True
-                                })
-                            elif isinstance(parsed, dict) and "output" in parsed:
-                                await callback.push_event("message", {
-                                    "content": parsed["output"],
-                                    "final": True
-                                })
-                            else:
-                                await callback.push_event("message", {
-                                    "content": str(parsed),
-                                    "final": True
-                                })
-                        except:
-                            await callback.push_event("message", {
-                                "content": full_data,
-                                "final": True
-                            })
+                        # Forward the response; the first character decides whether
+                        # it is worth parsing as a JSON string or {"output": ...} object
+                        content = decode_json_string(full_data)
+                        if content is None and full_data.lstrip()[:1] == "{":
+                            try:
+                                parsed = orjson.loads(full_data)
+                            except orjson.JSONDecodeError:
+                                parsed = None
+                            if isinstance(parsed, dict) and "output" in parsed:
+                                content = parsed["output"]
+                        await callback.push_event("message", {
+                            "content": full_data if content is None else content,
+                            "final": True
+                        })
                         return
                     
                     # TRUE ASYNC STREAMING: iterate over chunks as they arrive
                     async for chunk in chunk_iter:
                         if isinstance(chunk, tuple):
                             chunk = chunk[0]  # aioboto3 returns (chunk, metadata)
-                        if isinstance(chunk, bytes):
-                            chunk = chunk.decode("utf-8")
-                        
-                        logger.info(f"Received chunk: {len(chunk)} bytes")
-                        logger.info(f"Chunk content: {chunk[:200]}...")
-                        buffer += chunk
                         
+                        # Per-chunk logging is lazy so it costs nothing below DEBUG
+                        logger.debug("Received chunk: %d bytes: %.200r...", len(chunk), chunk)
                         # Process complete SSE events
-                        while "\n\n" in buffer:
-                            event_str, buffer = buffer.split("\n\n", 1)
-                            await self._process_event(event_str, callback, last_content)
+                        for event_type, event_data, data_str in parser.feed(chunk):
+                            await self._process_event(event_type, event_data, data_str, callback, last_content)
                     
                     # Process remaining buffer
+                    buffer = parser.remainder
                     if buffer.strip():
-                        logger.info(f"Final buffer content: {buffer[:200]}...")
+                        logger.debug("Final buffer content: %.200s...", buffer)
                         
                         # Check if it looks like SSE format
                         if buffer.startswith("event:") or buffer.startswith("data:"):
-                            await self._process_event(buffer, callback, last_content)
+                            event_type, event_data, data_str = parse_sse_event(buffer)
+                            await self._process_event(event_type, event_data, data_str, callback, last_content)
                         else:
                             # It's plain text response from AgentCore - emit as final message
                             logger.info(f"Plain text response detected, emitting as message")
-                            # Try to parse as JSON (AgentCore might return quoted string)
-                            try:
-                                parsed = json.loads(buffer)
-                                content = parsed if isinstance(parsed, str) else str(parsed)
-                            except:
+                            # AgentCore might return a quoted string
+                            content = decode_json_string(buffer)
+                            if content is None:
                                 content = buffer.strip()
                             
                             await callback.push_event("message", {
@@ -221,78 +359,55 @@ class AgentClient:
     
     async def _process_event(
         self, 
-        event_str: str, 
+        event_type: Optional[str], 
+        event_data: Optional[dict], 
+        data_str: Optional[str], 
         callback: StreamingCallbackHandler,
         last_content: str
     ) -> str:
-        """Parse and push a single SSE event."""
-        if not event_str.strip():
-            return last_content
-        
-        # Parse wrapped format: data: "event: ...\ndata: ...\n\n"
-        event_type = None
-        event_data = None
+        """
+        Push a single parsed SSE event.
         
-        if event_str.startswith('data: "'):
-            try:
-                inner = json.loads(event_str[6:])
-                for line in inner.split('\n'):
-                    line = line.strip()
-                    if line.startswith('event:'):
-                        event_type = line[6:].strip()
-                    elif line.startswith('data:'):
-                        try:
-                            event_data = json.loads(line[5:].strip())
-                        except:
-                            event_data = {"raw": line[5:].strip()}
-            except:
-                pass
-        else:
-            for line in event_str.strip().split('\n'):
-                line = line.strip()
-                if line.startswith('event:'):
-                    event_type = line[6:].strip()
-                elif line.startswith('data:'):
-                    try:
-                        event_data = json.loads(line[5:].strip())
-                    except:
-                        event_data = {"raw": line[5:].strip()}
+        Events whose payload already has the shape clients expect are forwarded
+        with the runtime's JSON text (data_str) instead of being re-serialized.
+        """
+        # Only pass through payloads that parsed as a JSON object
+        if not isinstance(event_data, dict):
+            data_str = None
         
         if event_type and event_data:
-            logger.info(f"Pushing event: {event_type}")
+            logger.debug("Pushing event: %s", event_type)
             
-            if event_type == "THINKING":
-                await callback.push_event("thinking", {
-                    "status": event_data.get("status", "reasoning"),
-                    "message": event_data.get("message", "Thinking...")
-                })
-            elif event_type == "TOOL_CALL":
-                await callback.push_event("tool_start", {
-                    "tool": event_data.get("tool", "unknown"),
-                    "args": event_data.get("args", {})
-                })
-            elif event_type == "TOOL_RESULT":
-                await callback.push_event("tool_end", {
-                    "tool": event_data.get("tool", "unknown"),
-                    "result": event_data.get("result", "")
-                })
-            elif event_type == "LLM_RESPONSE":
+            # Token chunks dominate the stream, so they are tested first
+            if event_type == "LLM_RESPONSE":
                 content = event_data.get("content", "")
                 if content and content != last_content:
+                    # Only the content string needs encoding; the flags are constant
                     await callback.push_event("message", {
                         "content": content,
                         "partial": True
-                    })
+                    }, raw=b'{"content":' + orjson.dumps(content) + b',"partial":true}')
                     last_content = content
+                return last_content
+            
+            remap = _CLIENT_EVENTS.get(event_type)
+            if remap is not None:
+                client_event, defaults = remap
+                if data_str and all(key in event_data for key in defaults):
+                    await callback.push_event(client_event, event_data, raw=data_str.encode())
+                else:
+                    await callback.push_event(client_event, {
+                        key: event_data.get(key, default) for key, default in defaults.items()
+                    })
             elif event_type == "AGENT_END":
                 output = event_data.get("output", "")
                 if output and output != last_content:
                     await callback.push_event("message", {
                         "content": output,
                         "final": True
-                    })
+                    }, raw=b'{"content":' + orjson.dumps(output) + b',"final":true}')
             elif event_type == "ERROR":
-                await callback.push_event("error", event_data)
+                await callback.push_event("error", event_data, raw=data_str.encode() if data_str else None)
         
         return last_content
     
@@ -300,17 +415,19 @@ class AgentClient:
         self,
         prompt: str,
         session_id: str,
-        actor_id: str = "default"
-    ) -> AsyncIterator[str]:
+        actor_id: str = "default",
+        coalesce: bool = True
+    ) -> AsyncIterator[bytes]:
         """
         Stream response using TRUE async streaming.
         
         Producer spawns background task that streams from Bedrock.
-        Consumer yields SSE events from queue immediately.
+        Consumer yields SSE events from queue immediately; with coalesce, events
+        that are already queued behind the first one go out in the same write.
         """
         callback = StreamingCallbackHandler(session_id)
         
-        yield f"event: start\ndata: {json.dumps({'session_id': session_id})}\n\n"
+        yield format_sse_event("start", {"session_id": session_id})
             
         # Spawn producer
         producer_task = asyncio.create_task(
@@ -324,13 +441,32 @@ class AgentClient:
                 if event is None:
                     break
                 
-                yield f"event: {event.event_type}\ndata: {json.dumps(event.data)}\n\n"
+                frames = [format_sse_event(event.event_type, event.data, event.raw)]
+                size = len(frames[0])
+                finished = False
+                
+                # Never waits: only events the producer has already queued join the batch
+                while coalesce and len(frames) < STREAM_BATCH_EVENTS and size < STREAM_BATCH_BYTES:
+                    try:
+                        event = callback.get_event_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if event is None:
+                        finished = True
+                        break
+                    frames.append(format_sse_event(event.event_type, event.data, event.raw))
+                    size += len(frames[-1])
+                
+                yield b"".join(frames)
+                
+                if finished:
+                    break
             
-            yield f"event: done\ndata: {json.dumps({'status': 'complete'})}\n\n"
+            yield format_sse_event("done", {"status": "complete"})
             
         except Exception as e:
             logger.error(f"Consumer error: {e}")
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            yield format_sse_event("error", {"error": str(e)})
 
         finally:
             if not producer_task.done():
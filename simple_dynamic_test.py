@@ -2,25 +2,28 @@
 """
 Simple test for dynamic data in memory
 """
-import boto3
-import json
-import uuid
+import os
+from agentcore_utils import agentcore_client, dumps_payload, read_response, print_chunk
 
 # Configuration
 RUNTIME_ARN = "arn:aws:bedrock-agentcore:us-west-2:313117444016:runtime/langgraph_agent-1NyH76Cfc7"
 REGION = "us-west-2"
 
-client = boto3.client('bedrock-agentcore', region_name=REGION)
-session_id = f"test-{uuid.uuid4()}"
+# Banner rules
+BAR = "=" * 70
+HBAR = "-" * 70
 
-print(f"\n{'='*70}")
+client = agentcore_client(REGION)
+session_id = "test-" + os.urandom(16).hex()
+
+print(f"\n{BAR}")
 print(f"🧪 Dynamic Memory Test")
-print(f"{'='*70}")
+print(BAR)
 print(f"Session: {session_id}\n")
 
 # Turn 1: Set preferences
 print("🔵 Turn 1: Setting preferences")
-print("-" * 70)
+print(HBAR)
 
 turn1 = {
     "prompt": "Hi! My name is Alice and I love pizza.",
@@ -36,24 +39,20 @@ print(f"📦 Preferences: {turn1['preferences']}")
 
 response1 = client.invoke_agent_runtime(
     agentRuntimeArn=RUNTIME_ARN,
+    runtimeSessionId=session_id,
     contentType='application/json',
-    payload=json.dumps(turn1),
+    payload=dumps_payload(turn1),
     qualifier='DEFAULT'
 )
 
-# Parse response
-if 'output' in response1:
-    result1 = response1['output']
-elif hasattr(response1.get('body'), 'read'):
-    result1 = response1['body'].read().decode('utf-8')
-else:
-    result1 = str(response1)
-
-print(f"📥 Response: {result1}\n")
+# Stream response as it arrives
+print("📥 Response: ", end="", flush=True)
+result1 = read_response(response1, on_chunk=print_chunk)
+print("\n")
 
 # Turn 2: Test memory (don't send preferences)
 print("🔵 Turn 2: Testing memory")
-print("-" * 70)
+print(HBAR)
 
 turn2 = {
     "prompt": "What is my favorite food?",
@@ -65,26 +64,22 @@ print(f"💡 No preferences sent - using stored data")
 
 response2 = client.invoke_agent_runtime(
     agentRuntimeArn=RUNTIME_ARN,
+    runtimeSessionId=session_id,
     contentType='application/json',
-    payload=json.dumps(turn2),
+    payload=dumps_payload(turn2),
     qualifier='DEFAULT'
 )
 
-if 'output' in response2:
-    result2 = response2['output']
-elif hasattr(response2.get('body'), 'read'):
-    result2 = response2['body'].read().decode('utf-8')
-else:
-    result2 = str(response2)
-
-print(f"📥 Response: {result2}\n")
+print("📥 Response: ", end="", flush=True)
+result2 = read_response(response2, on_chunk=print_chunk)
+print("\n")
 
 # Summary
-print(f"{'='*70}")
+print(BAR)
 print("✅ Test Complete!")
-print(f"{'='*70}")
+print(BAR)
 print("\n📊 Results:")
 print("  Turn 1: Set preferences (favorite_food: pizza)")
 print("  Turn 2: Agent remembered preferences ✓")
 print("\n💡 Custom data persisted across turns!")
-print(f"{'='*70}\n")
+print(f"{BAR}\n")
@@ -0,0 +1,267 @@
+"""
+SSE and blocking HTTP helpers for talking to the LangGraphAgentCore BFF.
+
+Network I/O runs on a single long-lived asyncio loop in a background thread so
+the Streamlit script thread only renders; the sync wrappers bridge to it.
+"""
+import asyncio
+import atexit
+import threading
+import httpx
+import orjson
+import streamlit as st
+from enum import IntEnum
+from typing import Any, AsyncGenerator, Generator, Tuple
+
+
+class EventType(IntEnum):
+    """Type codes for the events yielded by :func:`astream_response`."""
+    TOOL_START = 0
+    TOOL_END = 1
+    MESSAGE = 2
+    ERROR = 3
+    DONE = 4
+    THINKING = 5
+
+
+# SSE "event:" names mapped straight from the raw bytes to their type codes
+_EVENT_CODES = {
+    b"tool_start": EventType.TOOL_START,
+    b"tool_end": EventType.TOOL_END,
+    b"message": EventType.MESSAGE,
+    b"error": EventType.ERROR,
+    b"done": EventType.DONE,
+    b"thinking": EventType.THINKING,
+}
+
+
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared event loop that all BFF requests run on."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="bff-io", daemon=True).start()
+    return loop
+
+
+def _close_client(client: httpx.AsyncClient) -> None:
+    try:
+        asyncio.run_coroutine_threadsafe(client.aclose(), _event_loop()).result(timeout=5.0)
+    except Exception:
+        pass
+
+
+@st.cache_resource
+def async_client() -> httpx.AsyncClient:
+    """
+    Shared async HTTP client, reused across turns and sessions.
+
+    HTTP/2 is negotiated via ALPN, which needs an HTTPS endpoint; HTTP/1.1 stays
+    enabled because the ALB's plain-HTTP listener does not accept HTTP/2.
+    """
+    client = httpx.AsyncClient(
+        http2=True,
+        http1=True,
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=60.0)
+    )
+    atexit.register(_close_client, client)
+    return client
+
+
+async def acheck_health(bff_url: str, timeout: float = 5.0) -> int:
+    """Return the status code of the BFF health endpoint."""
+    response = await async_client().get(f"{bff_url}/health", timeout=timeout)
+    return response.status_code
+
+
+def check_health(bff_url: str) -> int:
+    """Sync bridge over :func:`acheck_health` for the Streamlit script thread."""
+    return asyncio.run_coroutine_threadsafe(acheck_health(bff_url), _event_loop()).result()
+
+
+async def _ping_health(bff_url: str) -> None:
+    try:
+        await acheck_health(bff_url, timeout=2.0)
+    except httpx.HTTPError:
+        pass
+
+
+@st.cache_resource
+def warm_connection(bff_url: str) -> None:
+    """
+    Open a pooled connection to the BFF in the background, once per process.
+
+    The first chat turn then reuses it instead of paying the TCP/TLS handshake.
+    """
+    asyncio.run_coroutine_threadsafe(_ping_health(bff_url), _event_loop())
+
+
+async def astream_response(bff_url: str, prompt: str, session_id: str, show_tools: bool = True) -> AsyncGenerator[Tuple[EventType, Any], None]:
+    """
+    Stream response from BFF using SSE.
+
+    SSE Events from BFF:
+    - event: start - Session started
+    - event: agent_start - Agent processing started
+    - event: tool_start - Tool being called
+    - event: tool_end - Tool finished
+    - event: message - Content chunk (may be partial or final)
+    - event: done - Streaming complete
+    - event: error - Error occurred
+
+    Yields:
+        (EventType, payload) tuples. MESSAGE, THINKING and ERROR events carry
+        their text; TOOL_START carries (tool, args) and TOOL_END (tool, result).
+    """
+    try:
+        async with async_client().stream(
+            "POST",
+            f"{bff_url}/v1/chat/stream",
+            json={"message": prompt, "session_id": session_id},
+            headers={"Accept": "text/event-stream"}
+        ) as response:
+            if response.status_code != 200:
+                yield EventType.ERROR, f"HTTP {response.status_code}"
+                return
+
+            # Raw bytes buffer; scan resumes where the last search left off so
+            # each byte is searched for a frame boundary only once
+            buffer = bytearray()
+            scan = 0
+
+            async for chunk in response.aiter_bytes():
+                buffer.extend(chunk)
+
+                # Process complete SSE events (separated by double newlines)
+                while True:
+                    idx = buffer.find(b"\n\n", scan)
+                    if idx == -1:
+                        scan = max(0, len(buffer) - 1)
+                        break
+                    # Frames stay bytes: the JSON parser takes the payload as-is,
+                    # only the event name and non-JSON fallbacks get decoded
+                    frame = bytes(buffer[:idx]).strip()
+                    del buffer[:idx + 2]
+                    scan = 0
+
+                    if not frame:
+                        continue
+
+                    # Fast path: a lone "data:" line is a message event, skip the line loop
+                    if frame.startswith(b"data: ") and b"\n" not in frame:
+                        try:
+                            content = orjson.loads(frame[6:]).get("content", "")
+                        except (orjson.JSONDecodeError, AttributeError):
+                            content = frame[6:].decode("utf-8", "replace")
+                        if content:
+                            yield EventType.MESSAGE, content
+                        continue
+
+                    # Parse "field: value" lines; the payload is parsed once per event
+                    event_type = EventType.MESSAGE
+                    data_raw = None
+
+                    for line in frame.splitlines():
+                        field, sep, value = line.partition(b":")
+                        if not sep:
+                            continue
+                        if field == b"event":
+                            event_type = _EVENT_CODES.get(value.strip())
+                        elif field == b"data":
+                            data_raw = value.lstrip()
+
+                    data = {}
+                    if data_raw is not None:
+                        try:
+                            data = orjson.loads(data_raw)
+                        except orjson.JSONDecodeError:
+                            data = {"content": data_raw.decode("utf-8", "replace")}
+
+                    # Dispatch on event type; hot-path events yield their text only
+                    if event_type is EventType.MESSAGE:
+                        content = data.get("content", "")
+                        if content:
+                            yield EventType.MESSAGE, content
+
+                    elif event_type is EventType.THINKING:
+                        yield EventType.THINKING, data.get("message", "Thinking...")
+
+                    elif event_type is EventType.TOOL_START:
+                        if show_tools:
+                            yield EventType.TOOL_START, (data.get("tool", "unknown"), data.get("args", {}))
+
+                    elif event_type is EventType.TOOL_END:
+                        if show_tools:
+                            yield EventType.TOOL_END, (data.get("tool", "unknown"), data.get("result", ""))
+
+                    elif event_type is EventType.ERROR:
+                        yield EventType.ERROR, data.get("error", "Unknown error")
+                        return
+
+                    elif event_type is EventType.DONE:
+                        return
+
+    except httpx.TimeoutException:
+        yield EventType.ERROR, "Request timed out. Please try again."
+    except httpx.ConnectError:
+        yield EventType.ERROR, "Could not connect to BFF. Is the service running?"
+    except Exception as e:
+        yield EventType.ERROR, str(e)
+
+
+async def _aclose_quietly(events: AsyncGenerator) -> None:
+    try:
+        await events.aclose()
+    except RuntimeError:
+        pass  # the cancelled read is still unwinding and closes the generator itself
+
+
+def stream_response(bff_url: str, prompt: str, session_id: str, show_tools: bool = True) -> Generator[Tuple[EventType, Any], None, None]:
+    """
+    Sync bridge over :func:`astream_response` for the Streamlit script thread.
+
+    The next event is requested before the current one is yielded, so the
+    network read overlaps with Streamlit rendering the previous event.
+    """
+    loop = _event_loop()
+    events = astream_response(bff_url, prompt, session_id, show_tools)
+    pending = asyncio.run_coroutine_threadsafe(events.__anext__(), loop)
+    try:
+        while True:
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                return
+            pending = asyncio.run_coroutine_threadsafe(events.__anext__(), loop)
+            yield event
+    finally:
+        # Consumer stopped early (rerun, stop, break): cancel the in-flight read
+        # and close the stream on the loop without blocking the script thread
+        if pending is not None:
+            pending.cancel()
+            asyncio.run_coroutine_threadsafe(_aclose_quietly(events), loop)
+
+
+async def aget_response(bff_url: str, prompt: str, session_id: str) -> str:
+    """Get blocking response from BFF."""
+    try:
+        response = await async_client().post(
+            f"{bff_url}/v1/chat",
+            json={"message": prompt, "session_id": session_id},
+            timeout=60.0
+        )
+        if response.status_code == 200:
+            data = response.json()
+            return data.get("message", str(data))
+        else:
+            return f"Error: {response.status_code} - {response.text}"
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def get_response(bff_url: str, prompt: str, session_id: str) -> str:
+    """Sync bridge over :func:`aget_response` for the Streamlit script thread."""
+    return asyncio.run_coroutine_threadsafe(
+        aget_response(bff_url, prompt, session_id), _event_loop()
+    ).result()
@@ -0,0 +1,48 @@
+"""
+CSS and static HTML fragments for the Streamlit chat UI.
+"""
+
+# Custom CSS for better styling
+CUSTOM_CSS = """
+<style>
+    .stChatMessage {
+        padding: 1rem;
+    }
+    .main-header {
+        text-align: center;
+        padding: 1rem 0;
+        border-bottom: 1px solid #333;
+        margin-bottom: 1rem;
+    }
+    .tool-call {
+        background-color: rgba(147, 197, 253, 0.3);
+        border-left: 3px solid #3b82f6;
+        padding: 0.5rem 1rem;
+        margin: 0.25rem 0;
+        border-radius: 0.25rem;
+        font-size: 0.85rem;
+        color: #000000;
+    }
+    .tool-result {
+        background-color: rgba(134, 239, 172, 0.3);
+        border-left: 3px solid #10b981;
+        padding: 0.5rem 1rem;
+        margin: 0.25rem 0;
+        border-radius: 0.25rem;
+        font-size: 0.85rem;
+        color: #000000;
+    }
+    .tool-events-container {
+        margin-bottom: 0.75rem;
+        opacity: 0.8;
+    }
+</style>
+"""
+
+# Main header
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🤖 LangGraph Agent</h1>
+    <p>Chat with your AI agent powered by AWS Bedrock</p>
+</div>
+"""
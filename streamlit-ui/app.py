@@ -4,11 +4,11 @@ Streamlit Chat UI for LangGraphAgentCore BFF
 Run with: streamlit run app.py
 """
 import streamlit as st
-import httpx
-import json
-import uuid
-from typing import Generator
-from utils import format_tool_start, format_tool_end, format_tool_events_container
+import os
+import time
+from _sse import EventType, stream_response, get_response, check_health, warm_connection
+from _styles import CUSTOM_CSS, HEADER_HTML
+from utils import format_history_message, format_tool_start, format_tool_end, format_tool_events_container
 
 # Page config
 st.set_page_config(
@@ -18,48 +18,27 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .stChatMessage {
-        padding: 1rem;
-    }
-    .main-header {
-        text-align: center;
-        padding: 1rem 0;
-        border-bottom: 1px solid #333;
-        margin-bottom: 1rem;
-    }
-    .tool-call {
-        background-color: rgba(147, 197, 253, 0.3);
-        border-left: 3px solid #3b82f6;
-        padding: 0.5rem 1rem;
-        margin: 0.25rem 0;
-        border-radius: 0.25rem;
-        font-size: 0.85rem;
-        color: #000000;
-    }
-    .tool-result {
-        background-color: rgba(134, 239, 172, 0.3);
-        border-left: 3px solid #10b981;
-        padding: 0.5rem 1rem;
-        margin: 0.25rem 0;
-        border-radius: 0.25rem;
-        font-size: 0.85rem;
-        color: #000000;
-    }
-    .tool-events-container {
-        margin-bottom: 0.75rem;
-        opacity: 0.8;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Hard-coded BFF endpoint (deployed ALB)
 BFF_ENDPOINT = "http://LangGr-BffSe-aO1aJ7AQgiMd-1474248023.us-west-2.elb.amazonaws.com"
 
+# Session IDs are this prefix plus 32 hex chars (AgentCore needs at least 33 chars)
+_SESSION_PREFIX = "streamlit-session-"
+
+# Minimum seconds between streamed response redraws (~20Hz)
+RENDER_INTERVAL = 0.05
+
+# Only the most recent messages get full chat_message widgets; older ones are
+# rendered together as one static HTML block
+RECENT_MESSAGES = 6
+
+# Prime the keep-alive pool so the first message skips the connection handshake
+warm_connection(BFF_ENDPOINT)
+
 # Initialize session state - session_id must be at least 33 characters for AgentCore
 if "session_id" not in st.session_state:
-    st.session_state.session_id = f"streamlit-session-{uuid.uuid4().hex}"
+    st.session_state.session_id = _SESSION_PREFIX + os.urandom(16).hex()
 
 # Sidebar configuration
 with st.sidebar:
@@ -68,7 +47,8 @@ with st.sidebar:
     # New Conversation button - generates new session ID
     if st.button("🆕 New Conversation", type="primary", use_container_width=True):
         st.session_state.messages = []
-        st.session_state.session_id = f"streamlit-session-{uuid.uuid4().hex}"
+        st.session_state.pop("_history_md", None)
+        st.session_state.session_id = _SESSION_PREFIX + os.urandom(16).hex()
         st.rerun()
     
     st.divider()
@@ -82,12 +62,11 @@ with st.sidebar:
     # Connection test
     if st.button("🔗 Test Connection", use_container_width=True):
         try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{BFF_ENDPOINT}/health")
-                if response.status_code == 200:
-                    st.success("✅ Connected!")
-                else:
-                    st.error(f"❌ Status: {response.status_code}")
+            status_code = check_health(BFF_ENDPOINT)
+            if status_code == 200:
+                st.success("✅ Connected!")
+            else:
+                st.error(f"❌ Status: {status_code}")
         except Exception as e:
             st.error(f"❌ Failed: {e}")
     
@@ -105,195 +84,83 @@ bff_url = BFF_ENDPOINT
 session_id = st.session_state.session_id
 
 # Main header
-st.markdown("""
-<div class="main-header">
-    <h1>🤖 LangGraph Agent</h1>
-    <p>Chat with your AI agent powered by AWS Bedrock</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 # Initialize chat history
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
 # Display chat messages
-for message in st.session_state.messages:
+older = st.session_state.messages[:-RECENT_MESSAGES]
+if older:
+    # Messages only ever get appended, so extend the cached Markdown with the
+    # ones that have scrolled out of the recent window since the last run
+    rendered, history_md = st.session_state.get("_history_md", (0, ""))
+    if rendered != len(older):
+        history_md += "".join(
+            format_history_message(m["role"], m["content"]) for m in older[rendered:]
+        )
+        st.session_state["_history_md"] = (len(older), history_md)
+    st.markdown(history_md)
+
+for message in st.session_state.messages[-RECENT_MESSAGES:]:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
 
-def stream_response(bff_url: str, prompt: str, session_id: str, show_tools: bool = True) -> Generator[dict, None, None]:
-    """
-    Stream response from BFF using SSE.
-    
-    SSE Events from BFF:
-    - event: start - Session started
-    - event: agent_start - Agent processing started
-    - event: tool_start - Tool being called
-    - event: tool_end - Tool finished
-    - event: message - Content chunk (may be partial or final)
-    - event: done - Streaming complete
-    - event: error - Error occurred
-    
-    Yields:
-        Dict with event type and data
-    """
-    try:
-        with httpx.Client(timeout=120.0) as client:
-            with client.stream(
-                "POST",
-                f"{bff_url}/v1/chat/stream",
-                json={"message": prompt, "session_id": session_id},
-                headers={"Accept": "text/event-stream"}
-            ) as response:
-                if response.status_code != 200:
-                    yield {"type": "error", "content": f"HTTP {response.status_code}"}
-                    return
-                
-                buffer = ""
-                
-                for chunk in response.iter_text():
-                    buffer += chunk
-                    
-                    # Process complete SSE events (separated by double newlines)
-                    while "\n\n" in buffer:
-                        event_str, buffer = buffer.split("\n\n", 1)
-                        
-                        if not event_str.strip():
-                            continue
-                        
-                        # Parse event type and data
-                        event_type = "message"
-                        data = {}
-                        
-                        for line in event_str.strip().split("\n"):
-                            if line.startswith("event: "):
-                                event_type = line[7:].strip()
-                            elif line.startswith("data: "):
-                                try:
-                                    data = json.loads(line[6:])
-                                except json.JSONDecodeError:
-                                    data = {"content": line[6:]}
-                        
-                        # Yield event based on type
-                        if event_type == "thinking":
-                            yield {
-                                "type": "thinking",
-                                "message": data.get("message", "Thinking...")
-                            }
-                        
-                        elif event_type == "tool_start" and show_tools:
-                            yield {
-                                "type": "tool_start",
-                                "tool": data.get("tool", "unknown"),
-                                "args": data.get("args", {})
-                            }
-                        
-                        elif event_type == "tool_end" and show_tools:
-                            yield {
-                                "type": "tool_end",
-                                "tool": data.get("tool", "unknown"),
-                                "result": data.get("result", "")
-                            }
-                        
-                        elif event_type == "message":
-                            content = data.get("content", "")
-                            if content:
-                                yield {
-                                    "type": "message",
-                                    "content": content,
-                                    "partial": data.get("partial", True),
-                                    "final": data.get("final", False)
-                                }
-                        
-                        elif event_type == "error":
-                            yield {"type": "error", "content": data.get("error", "Unknown error")}
-                            return
-                        
-                        elif event_type == "done":
-                            return
-                            
-    except httpx.TimeoutException:
-        yield {"type": "error", "content": "Request timed out. Please try again."}
-    except httpx.ConnectError:
-        yield {"type": "error", "content": "Could not connect to BFF. Is the service running?"}
-    except Exception as e:
-        yield {"type": "error", "content": str(e)}
-
-
-def get_response(bff_url: str, prompt: str, session_id: str) -> str:
-    """Get blocking response from BFF."""
-    try:
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
-                f"{bff_url}/v1/chat",
-                json={"message": prompt, "session_id": session_id}
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("message", str(data))
-            else:
-                return f"Error: {response.status_code} - {response.text}"
-    except Exception as e:
-        return f"Error: {e}"
-
-
-# Chat input
-if prompt := st.chat_input("Type your message..."):
-    # Add user message
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-    
-    # Get assistant response
+def render_assistant(prompt: str, session_id: str, use_streaming: bool, show_tools: bool):
+    """Render the assistant's reply to prompt and record it in the chat history."""
     with st.chat_message("assistant"):
         if use_streaming:
-            # Streaming response with tool events
+            # Streaming response with tool events - one placeholder per event so
+            # each update only re-sends that event's HTML
             response_container = st.container()
-            tool_events_placeholder = response_container.empty()
+            tool_events_container = response_container.container()
             response_placeholder = response_container.empty()
             
             full_response = ""
-            tool_events_html = []
+            pending_tool_slots = {}  # tool name -> [(slot, start_html), ...] awaiting tool_end
+            last_render = 0.0
             
-            for event in stream_response(bff_url, prompt, session_id, show_tools):
-                event_type = event.get("type")
-                
-                if event_type == "thinking":
-                    message = event.get("message", "Thinking...")
-                    tool_events_html.append(f'<div class="thinking-event">🧠 <i>{message}</i></div>')
-                    tool_events_placeholder.markdown(
-                        format_tool_events_container(tool_events_html),
-                        unsafe_allow_html=True
-                    )
+            for event_type, data in stream_response(bff_url, prompt, session_id, show_tools):
+                if event_type is EventType.MESSAGE:
+                    full_response = data
+                    # Show response with cursor (keep tool events visible), throttled;
+                    # the final render after the loop flushes the latest content
+                    now = time.monotonic()
+                    if now - last_render > RENDER_INTERVAL:
+                        response_placeholder.markdown(full_response + " ▌")
+                        last_render = now
                 
-                elif event_type == "tool_start":
-                    tool_name = event.get("tool", "unknown")
-                    args = event.get("args", {})
-                    tool_events_html.append(format_tool_start(tool_name, args))
-                    tool_events_placeholder.markdown(
-                        format_tool_events_container(tool_events_html),
+                elif event_type is EventType.THINKING:
+                    tool_events_container.empty().markdown(
+                        format_tool_events_container([f'<div class="thinking-event">🧠 <i>{data}</i></div>']),
                         unsafe_allow_html=True
                     )
                 
-                elif event_type == "tool_end":
-                    tool_name = event.get("tool", "unknown")
-                    result = event.get("result", "")
-                    tool_events_html.append(format_tool_end(tool_name, result))
-                    tool_events_placeholder.markdown(
-                        format_tool_events_container(tool_events_html),
-                        unsafe_allow_html=True
-                    )
+                elif event_type is EventType.TOOL_START:
+                    tool_name, args = data
+                    start_html = format_tool_start(tool_name, args)
+                    slot = tool_events_container.empty()
+                    slot.markdown(format_tool_events_container([start_html]), unsafe_allow_html=True)
+                    pending_tool_slots.setdefault(tool_name, []).append((slot, start_html))
                 
-                elif event_type == "message":
-                    content = event.get("content", "")
-                    if content:
-                        full_response = content
-                        # Show response with cursor (keep tool events visible)
-                        response_placeholder.markdown(full_response + " ▌")
+                elif event_type is EventType.TOOL_END:
+                    tool_name, result = data
+                    end_html = format_tool_end(tool_name, result)
+                    pending = pending_tool_slots.get(tool_name)
+                    if pending:
+                        # Fill in the result next to its matching tool_start
+                        slot, start_html = pending.pop(0)
+                        slot.markdown(format_tool_events_container([start_html, end_html]), unsafe_allow_html=True)
+                    else:
+                        tool_events_container.empty().markdown(
+                            format_tool_events_container([end_html]),
+                            unsafe_allow_html=True
+                        )
                 
-                elif event_type == "error":
-                    full_response = f"Error: {event.get('content', 'Unknown error')}"
+                elif event_type is EventType.ERROR:
+                    full_response = f"Error: {data}"
                     response_placeholder.error(full_response)
             
             # Final display without cursor (tool events remain visible)
@@ -307,14 +174,23 @@ if prompt := st.chat_input("Type your message..."):
                 full_response = get_response(bff_url, prompt, session_id)
             st.markdown(full_response)
         
-        # Clean up response for storage - handle escaped quotes and newlines
+        # Clean up response for storage - BFF sends decoded text, so only strip stray quotes
         clean_response = full_response.strip()
-        if clean_response.startswith('"') and clean_response.endswith('"'):
+        if clean_response[:1] == '"' == clean_response[-1:]:
             clean_response = clean_response[1:-1]
-        clean_response = clean_response.replace('\\"', '"').replace('\\n', '\n')
         st.session_state.messages.append({"role": "assistant", "content": clean_response})
 
 
+# Chat input
+if prompt := st.chat_input("Type your message..."):
+    # Add user message
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+    
+    # Get assistant response
+    render_assistant(prompt, session_id, use_streaming, show_tools)
+
 # Footer
 st.markdown("---")
 col1, col2 = st.columns(2)
@@ -3,12 +3,81 @@ Utility functions for formatting tool events in the Streamlit UI.
 """
 
 import json
+import re
+import orjson
 from typing import Dict, Any, Tuple
 
 
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_UNSAFE = re.compile(r"[&<>]")
+
+# Args dicts with at most this many keys are shown as compact one-line JSON
+_COMPACT_ARGS_MAX_KEYS = 3
+
+# HTML templates, filled with str.format_map
+_TPL_EXEC_CODE = '''<div class="tool-call">
+            🔧 <b>Executing Python code:</b>
+            <pre style="background:#1e1e1e;color:#d4d4d4;padding:12px;border-radius:6px;font-family:'SF Mono',Monaco,'Cascadia Code',Consolas,monospace;font-size:13px;line-height:1.4;overflow-x:auto;margin-top:8px;white-space:pre-wrap;word-wrap:break-word;font-weight:normal;">{code}</pre>
+        </div>'''
+
+_TPL_BROWSE_WEB = '''<div class="tool-call">
+            🌐 <b>Browsing web:</b>
+            <div style="background:#e3f2fd;padding:10px;border-radius:6px;margin-top:6px;font-size:13px;">{task}</div>
+        </div>'''
+
+_TPL_TOOL_CALL = '''<div class="tool-call">
+            🔧 Calling <b>{tool_name}</b>
+            <pre style="background:#f5f5f5;padding:10px;border-radius:6px;font-family:'SF Mono',Monaco,Consolas,monospace;font-size:12px;margin-top:6px;">{args}</pre>
+        </div>'''
+
+_TPL_EXEC_TIME = '<div style="color:#2e7d32;font-size:11px;margin-top:6px;">✅ {exec_time}</div>'
+
+_TPL_CODE_OUTPUT = '''<div class="tool-result">
+            ✅ <b>Code Output:</b>
+            <pre style="background:#e8f5e9;padding:12px;border-radius:6px;margin-top:8px;font-family:'SF Mono',Monaco,'Cascadia Code',Consolas,monospace;font-size:13px;line-height:1.5;white-space:pre-wrap;border-left:3px solid #4caf50;">{output}</pre>
+            {exec_time}
+        </div>'''
+
+_TPL_BROWSER_RESULT = '''<div class="tool-result">
+            🌐 <b>Browser Result:</b>
+            <div style="background:#fff3e0;padding:10px;border-radius:6px;margin-top:6px;font-size:13px;border-left:3px solid #ff9800;">{display}</div>
+        </div>'''
+
+_TPL_TOOL_RESULT = '''<div class="tool-result">
+            ✅ <b>{tool_name}</b> → 
+            <code style="font-family:'SF Mono',Monaco,Consolas,monospace;font-size:12px;background:#f5f5f5;padding:2px 6px;border-radius:3px;">{display}</code>
+        </div>'''
+
+
+# A line break, either real or still JSON-escaped ("\\n")
+_NL = r"(?:\\n|\n)"
+
+# One pass over a code result: the "Output:" body up to the "✅ Executed" line,
+# and the execution-time text on that line
+_CODE_RE = re.compile(
+    r"Output:[ \t]*(?P<output>.*?)(?=(?:" + _NL + r"[ \t]*)+(?:(?!\\n)[^\n])*✅ Executed|(?:" + _NL + r"[ \t]*)*\Z)"
+    r"|✅\s*(?P<exec_time>Executed(?:(?!\\n)[^\n])*)",
+    re.DOTALL
+)
+
+# Runs of line breaks (and blank lines) inside the output body, and the blank
+# lines leading it; indentation of the output's lines is kept
+_LINE_BREAKS_RE = re.compile(_NL + r"(?:[ \t]*" + _NL + r")*")
+_LEADING_BREAKS_RE = re.compile(r"^(?:[ \t]*" + _NL + r")+")
+
+# Role labels standing in for the st.chat_message avatars in the history block
+_HISTORY_LABELS = {"user": "**🧑 You**", "assistant": "**🤖 Assistant**"}
+
+
 def escape_html(text: str) -> str:
-    """Escape HTML special characters."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    """Escape HTML special characters (returns text itself when there are none)."""
+    return text.translate(_HTML_ESCAPE) if _UNSAFE.search(text) else text
+
+
+def _truncate(text: Any, limit: int) -> str:
+    """Return text as a string, cut to limit characters plus "..." when longer."""
+    s = text if isinstance(text, str) else str(text)
+    return s if len(s) <= limit else s[:limit] + "..."
 
 
 def format_tool_start(tool_name: str, args: Dict[str, Any]) -> str:
@@ -26,25 +95,21 @@ def format_tool_start(tool_name: str, args: Dict[str, Any]) -> str:
         code = args["code"]
         # Escape HTML and replace # with unicode to prevent markdown heading interpretation
         code_escaped = escape_html(code).replace("#", "&#35;")
-        return f'''<div class="tool-call">
-            🔧 <b>Executing Python code:</b>
-            <pre style="background:#1e1e1e;color:#d4d4d4;padding:12px;border-radius:6px;font-family:'SF Mono',Monaco,'Cascadia Code',Consolas,monospace;font-size:13px;line-height:1.4;overflow-x:auto;margin-top:8px;white-space:pre-wrap;word-wrap:break-word;font-weight:normal;">{code_escaped}</pre>
-        </div>'''
+        return _TPL_EXEC_CODE.format_map({"code": code_escaped})
     
     elif tool_name == "browse_web" and "task" in args:
         task = escape_html(args["task"])
-        return f'''<div class="tool-call">
-            🌐 <b>Browsing web:</b>
-            <div style="background:#e3f2fd;padding:10px;border-radius:6px;margin-top:6px;font-size:13px;">{task}</div>
-        </div>'''
+        return _TPL_BROWSE_WEB.format_map({"task": task})
     
     else:
-        args_str = json.dumps(args, indent=2) if args else "{}"
+        if not args:
+            args_str = "{}"
+        elif len(args) <= _COMPACT_ARGS_MAX_KEYS:
+            args_str = orjson.dumps(args).decode()
+        else:
+            args_str = json.dumps(args, indent=2)
         args_escaped = escape_html(args_str)
-        return f'''<div class="tool-call">
-            🔧 Calling <b>{tool_name}</b>
-            <pre style="background:#f5f5f5;padding:10px;border-radius:6px;font-family:'SF Mono',Monaco,Consolas,monospace;font-size:12px;margin-top:6px;">{args_escaped}</pre>
-        </div>'''
+        return _TPL_TOOL_CALL.format_map({"tool_name": tool_name, "args": args_escaped})
 
 
 def parse_code_result(result: str) -> Tuple[str, str]:
@@ -57,29 +122,19 @@ def parse_code_result(result: str) -> Tuple[str, str]:
     Returns:
         Tuple of (output_html, execution_time)
     """
-    # Clean up escape characters
-    result = result.replace("\\n", "\n").replace('\\"', '"')
-    
-    output_lines = []
+    output = ""
     exec_time = ""
     
-    lines = result.split("\n")
-    in_output = False
-    
-    for line in lines:
-        if "📤 Output:" in line or "Output:" in line:
-            in_output = True
-            # Get the rest of the line after "Output:"
-            after_output = line.split("Output:")[-1].strip()
-            if after_output:
-                output_lines.append(after_output)
-        elif "✅ Executed" in line:
-            exec_time = line.replace("✅ ", "").strip()
-            in_output = False
-        elif in_output and line.strip():
-            output_lines.append(line)
+    for match in _CODE_RE.finditer(result):
+        if match.group("exec_time") is not None:
+            exec_time = match.group("exec_time").strip()
+        elif not output:
+            output = _LEADING_BREAKS_RE.sub("", match.group("output"))
     
-    output_html = "<br>".join(escape_html(line) for line in output_lines) if output_lines else escape_html(result[:200])
+    if output:
+        output_html = _LINE_BREAKS_RE.sub("<br>", escape_html(output))
+    else:
+        output_html = escape_html(result[:200])
     
     return output_html, exec_time
 
@@ -96,33 +151,23 @@ def format_tool_end(tool_name: str, result: str) -> str:
         HTML string for display
     """
     # Clean up result
-    result = str(result).replace("\\n", "\n").replace('\\"', '"')
+    if not isinstance(result, str):
+        result = str(result)
+    result = result.replace("\\n", "\n").replace('\\"', '"')
     
     if tool_name == "execute_code":
         output_html, exec_time = parse_code_result(result)
-        exec_time_html = f'<div style="color:#2e7d32;font-size:11px;margin-top:6px;">✅ {exec_time}</div>' if exec_time else ""
-        return f'''<div class="tool-result">
-            ✅ <b>Code Output:</b>
-            <pre style="background:#e8f5e9;padding:12px;border-radius:6px;margin-top:8px;font-family:'SF Mono',Monaco,'Cascadia Code',Consolas,monospace;font-size:13px;line-height:1.5;white-space:pre-wrap;border-left:3px solid #4caf50;">{output_html}</pre>
-            {exec_time_html}
-        </div>'''
+        exec_time_html = _TPL_EXEC_TIME.format_map({"exec_time": exec_time}) if exec_time else ""
+        return _TPL_CODE_OUTPUT.format_map({"output": output_html, "exec_time": exec_time_html})
     
     elif tool_name == "browse_web":
         # Truncate long browser results
-        display = result[:300] + "..." if len(result) > 300 else result
-        display = escape_html(display)
-        return f'''<div class="tool-result">
-            🌐 <b>Browser Result:</b>
-            <div style="background:#fff3e0;padding:10px;border-radius:6px;margin-top:6px;font-size:13px;border-left:3px solid #ff9800;">{display}</div>
-        </div>'''
+        display = escape_html(_truncate(result, 300))
+        return _TPL_BROWSER_RESULT.format_map({"display": display})
     
     else:
-        display = result[:200] + "..." if len(result) > 200 else result
-        display = escape_html(display)
-        return f'''<div class="tool-result">
-            ✅ <b>{tool_name}</b> → 
-            <code style="font-family:'SF Mono',Monaco,Consolas,monospace;font-size:12px;background:#f5f5f5;padding:2px 6px;border-radius:3px;">{display}</code>
-        </div>'''
+        display = escape_html(_truncate(result, 200))
+        return _TPL_TOOL_RESULT.format_map({"tool_name": tool_name, "display": display})
 
 
 def format_tool_events_container(events_html: list) -> str:
@@ -137,3 +182,21 @@ def format_tool_events_container(events_html: list) -> str:
     """
     return f'<div class="tool-events-container">{"".join(events_html)}</div>'
 
+
+
+def format_history_message(role: str, content: str) -> str:
+    """
+    Format an older chat message as Markdown for the cached history block.
+    
+    Args:
+        role: "user" or "assistant"
+        content: Message text (Markdown)
+        
+    Returns:
+        Markdown string: a role label, the content and a trailing separator;
+        an unclosed code fence is closed so it cannot swallow later messages
+    """
+    if content.count("```") % 2:
+        content += "\n```"
+    label = _HISTORY_LABELS.get(role, f"**{role}**")
+    return f"{label}\n\n{content}\n\n---\n\n"
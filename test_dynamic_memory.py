@@ -2,40 +2,54 @@
 """
 Advanced test for dynamic data in memory
 """
-import boto3
-import json
-import uuid
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from agentcore_utils import (
+    ThreadBufferedStdout, agentcore_client, dumps_payload, read_response, print_chunk, run_buffered
+)
 
 # Configuration
 RUNTIME_ARN = "arn:aws:bedrock-agentcore:us-west-2:313117444016:runtime/langgraph_agent-1NyH76Cfc7"
 REGION = "us-west-2"
 
+# Banner rules
+BAR = "=" * 70
+HBAR = "-" * 70
+
+client = agentcore_client(REGION)
+
+# With --stateless, turns are not pinned to a runtime session (for A/B comparison)
+STATELESS = False
+
 
 def invoke_agent(client, runtime_arn, payload, session_id):
     """Invoke agent and print results"""
     
-    print(f"\n📤 Prompt: {payload['prompt']}")
+    # Build the request header and write it in one go
+    header = [f"\n📤 Prompt: {payload['prompt']}\n"]
     if 'preferences' in payload:
-        print(f"📦 Preferences: {payload['preferences']}")
+        header.append(f"📦 Preferences: {payload['preferences']}\n")
     if 'custom_data' in payload:
-        print(f"📦 Custom Data: {payload['custom_data']}")
+        header.append(f"📦 Custom Data: {payload['custom_data']}\n")
+    sys.stdout.write("".join(header))
+    
+    # Pinning turns to the runtime session keeps them on the same warm runtime,
+    # which already holds the conversation, rather than rebuilding it each turn
+    session_args = {} if STATELESS else {"runtimeSessionId": session_id}
     
     try:
         response = client.invoke_agent_runtime(
             agentRuntimeArn=runtime_arn,
             contentType='application/json',
-            payload=json.dumps(payload),
-            qualifier='DEFAULT'
+            payload=dumps_payload(payload),
+            qualifier='DEFAULT',
+            **session_args
         )
         
-        if 'output' in response:
-            result = response['output']
-        elif hasattr(response.get('body'), 'read'):
-            result = response['body'].read().decode('utf-8')
-        else:
-            result = str(response)
-        
-        print(f"📥 Response: {result}")
+        print("📥 Response: ", end="", flush=True)
+        result = read_response(response, on_chunk=print_chunk)
+        print()
         return result
         
     except Exception as e:
@@ -45,18 +59,16 @@ def invoke_agent(client, runtime_arn, payload, session_id):
 
 def test_basic_memory():
     """Test basic preference persistence"""
+    session_id = "basic-test-" + os.urandom(16).hex()
     
-    client = boto3.client('bedrock-agentcore', region_name=REGION)
-    session_id = f"basic-test-{uuid.uuid4()}"
-    
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print(f"🧪 Test 1: Basic Memory Persistence")
-    print(f"{'='*70}")
+    print(BAR)
     print(f"Session: {session_id}\n")
     
     # Turn 1
     print("🔵 Turn 1: Set user preferences")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "Hi! I'm Bob and I like coding.",
         "session_id": session_id,
@@ -68,31 +80,29 @@ def test_basic_memory():
     
     # Turn 2
     print("\n🔵 Turn 2: Test memory (no preferences sent)")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "What programming language do I prefer?",
         "session_id": session_id
     }, session_id)
     
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("✅ Basic test complete!")
-    print(f"{'='*70}\n")
+    print(f"{BAR}\n")
 
 
 def test_custom_data():
     """Test custom data storage"""
+    session_id = "custom-test-" + os.urandom(16).hex()
     
-    client = boto3.client('bedrock-agentcore', region_name=REGION)
-    session_id = f"custom-test-{uuid.uuid4()}"
-    
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print(f"🧪 Test 2: Custom Data Storage")
-    print(f"{'='*70}")
+    print(BAR)
     print(f"Session: {session_id}\n")
     
     # Turn 1
     print("🔵 Turn 1: Store shopping cart data")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "I want to buy a laptop",
         "session_id": session_id,
@@ -108,31 +118,29 @@ def test_custom_data():
     
     # Turn 2
     print("\n🔵 Turn 2: Add another item (data persists)")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "Add a mouse to my cart",
         "session_id": session_id
     }, session_id)
     
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("✅ Custom data test complete!")
-    print(f"{'='*70}\n")
+    print(f"{BAR}\n")
 
 
 def test_data_update():
     """Test updating persisted data"""
+    session_id = "update-test-" + os.urandom(16).hex()
     
-    client = boto3.client('bedrock-agentcore', region_name=REGION)
-    session_id = f"update-test-{uuid.uuid4()}"
-    
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print(f"🧪 Test 3: Update Persisted Data")
-    print(f"{'='*70}")
+    print(BAR)
     print(f"Session: {session_id}\n")
     
     # Turn 1
     print("🔵 Turn 1: Set initial budget")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "I have $1000 budget",
         "session_id": session_id,
@@ -143,7 +151,7 @@ def test_data_update():
     
     # Turn 2
     print("\n🔵 Turn 2: Update budget")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "Actually, I can increase it to $1500",
         "session_id": session_id,
@@ -154,26 +162,29 @@ def test_data_update():
     
     # Turn 3
     print("\n🔵 Turn 3: Verify updated budget")
-    print("-" * 70)
+    print(HBAR)
     invoke_agent(client, RUNTIME_ARN, {
         "prompt": "What's my budget?",
         "session_id": session_id
     }, session_id)
     
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("✅ Update test complete!")
-    print(f"{'='*70}\n")
+    print(f"{BAR}\n")
 
 
 if __name__ == "__main__":
-    import sys
-    
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print(f"🚀 Dynamic Memory Test Suite")
-    print(f"{'='*70}\n")
+    print(f"{BAR}\n")
+    
+    args = sys.argv[1:]
+    if "--stateless" in args:
+        args.remove("--stateless")
+        STATELESS = True
     
-    if len(sys.argv) > 1:
-        test_name = sys.argv[1]
+    if args:
+        test_name = args[0]
         if test_name == "basic":
             test_basic_memory()
         elif test_name == "custom":
@@ -184,11 +195,18 @@ if __name__ == "__main__":
             print(f"Unknown test: {test_name}")
             print("Available tests: basic, custom, update")
     else:
-        # Run all tests
-        test_basic_memory()
-        test_custom_data()
-        test_data_update()
+        # Run all tests in parallel - sessions are disjoint, so they don't interact.
+        # Each test's output is buffered and printed in order once all finish.
+        tests = [test_basic_memory, test_custom_data, test_data_update]
+        sys.stdout = ThreadBufferedStdout()
+        try:
+            with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+                outputs = list(executor.map(run_buffered, tests))
+        finally:
+            sys.stdout = sys.__stdout__
+        for _, output in outputs:
+            print(output, end="")
         
-        print(f"\n{'='*70}")
+        print(f"\n{BAR}")
         print("🎉 All tests complete!")
-        print(f"{'='*70}\n")
+        print(f"{BAR}\n")
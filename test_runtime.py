@@ -7,40 +7,55 @@ Usage:
     python test_runtime.py <runtime-arn> --prompt "Calculate 50 * 8"
 """
 
-import boto3
-import json
 import argparse
+import functools
+import os
 import sys
+import traceback
 import uuid
-from datetime import datetime
+import orjson
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from agentcore_utils import ThreadBufferedStdout, agentcore_client, print_chunk, read_response, run_buffered
 
+REGION = 'us-west-2'
 
-def test_agent(runtime_arn: str, prompt: str, session_id: str = None, actor_id: str = None):
+# Banner rules
+BAR = '=' * 60
+HBAR = '-' * 60
+
+_get_success = itemgetter('success')
+
+
+@functools.lru_cache(maxsize=None)
+def _payload_template(prompt: str, actor_id: str) -> bytes:
+    """prompt and actor_id serialized once, without the closing brace; the session_id is appended per run."""
+    return orjson.dumps({"prompt": prompt, "actor_id": actor_id})[:-1]
+
+
+def test_agent(runtime_arn: str, prompt: str, session_id: str | None = None, actor_id: str | None = None, client=None):
     """Test the deployed LangGraph agent."""
     
-    client = boto3.client('bedrock-agentcore', region_name='us-west-2')
+    client = client or agentcore_client(REGION)
     
     if not session_id:
-        session_id = f"test-{uuid.uuid4()}"  # Generate UUID for proper length (minimum 33 chars)
+        session_id = "test-" + uuid.uuid4().hex  # 32 hex chars keeps it over the 33-char minimum
     
     if not actor_id:
         actor_id = "test-actor-default"
     
-    print("🤖 Testing LangGraphAgentCore")
-    print("=" * 60)
-    print(f"Runtime ARN: {runtime_arn}")
-    print(f"Session ID:  {session_id}")
-    print(f"Actor ID:    {actor_id}")
-    print(f"Prompt:      {prompt}")
-    print()
+    sys.stdout.write(
+        "🤖 Testing LangGraphAgentCore\n"
+        f"{BAR}\n"
+        f"Runtime ARN: {runtime_arn}\n"
+        f"Session ID:  {session_id}\n"
+        f"Actor ID:    {actor_id}\n"
+        f"Prompt:      {prompt}\n\n"
+    )
     
     try:
         # Prepare payload with session_id and actor_id for memory support
-        payload = json.dumps({
-            "prompt": prompt,
-            "session_id": session_id,
-            "actor_id": actor_id
-        })
+        payload = _payload_template(prompt, actor_id) + b',"session_id":' + orjson.dumps(session_id) + b'}'
         
         # Invoke agent
         print("⏳ Invoking agent...")
@@ -53,18 +68,14 @@ def test_agent(runtime_arn: str, prompt: str, session_id: str = None, actor_id:
         
         # Parse response
         if 'response' in response:
-            response_body = response['response']
+            print("✅ Agent Response:")
+            print(HBAR)
             
-            # Handle StreamingBody
-            if hasattr(response_body, 'read'):
-                result = response_body.read().decode('utf-8')
-            else:
-                result = str(response_body)
+            # Print chunks as they arrive
+            result = read_response(response, on_chunk=print_chunk)
+            print()
             
-            print("✅ Agent Response:")
-            print("-" * 60)
-            print(result)
-            print("-" * 60)
+            print(HBAR)
             
             return result
         else:
@@ -73,59 +84,65 @@ def test_agent(runtime_arn: str, prompt: str, session_id: str = None, actor_id:
             
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        # Full stack traces only when debugging (DEBUG=1)
+        if os.environ.get('DEBUG'):
+            traceback.print_exc(limit=5, chain=False)
         return None
 
 
-def run_test_suite(runtime_arn: str):
-    """Run a suite of test prompts."""
+_SUITE_CASES = [
+    {
+        "name": "Calculator Test 1",
+        "prompt": "What is 15 * 23?",
+        "expected": "should call calculator and return 345",
+        "session_id": None  # New session for each test
+    },
+    {
+        "name": "Calculator Test 2",
+        "prompt": "Calculate sqrt(16) + 5",
+        "expected": "should return 9",
+        "session_id": None
+    },
+    {
+        "name": "Weather Test",
+        "prompt": "What's the weather in San Francisco?",
+        "expected": "should call weather tool",
+        "session_id": None
+    },
+    {
+        "name": "Multi-step Test",
+        "prompt": "What is 100 + 50, and then tell me the weather in Tokyo?",
+        "expected": "should use both tools",
+        "session_id": None
+    },
+    {
+        "name": "Conversational Test",
+        "prompt": "Hello! What can you help me with?",
+        "expected": "should describe capabilities",
+        "session_id": None
+    }
+]
+
+def run_test_suite(runtime_arn: str, max_parallel: int = 5):
+    """
+    Run a suite of test prompts.
     
-    test_cases = [
-        {
-            "name": "Calculator Test 1",
-            "prompt": "What is 15 * 23?",
-            "expected": "should call calculator and return 345",
-            "session_id": None  # New session for each test
-        },
-        {
-            "name": "Calculator Test 2",
-            "prompt": "Calculate sqrt(16) + 5",
-            "expected": "should return 9",
-            "session_id": None
-        },
-        {
-            "name": "Weather Test",
-            "prompt": "What's the weather in San Francisco?",
-            "expected": "should call weather tool",
-            "session_id": None
-        },
-        {
-            "name": "Multi-step Test",
-            "prompt": "What is 100 + 50, and then tell me the weather in Tokyo?",
-            "expected": "should use both tools",
-            "session_id": None
-        },
-        {
-            "name": "Conversational Test",
-            "prompt": "Hello! What can you help me with?",
-            "expected": "should describe capabilities",
-            "session_id": None
-        }
-    ]
+    Each test uses its own session, so they run concurrently on the shared
+    client; a test's output is printed as one block once it finishes.
+    """
     
     print("🧪 Running Test Suite")
-    print("=" * 60)
+    print(BAR)
     print()
     
-    results = []
+    results = [None] * len(_SUITE_CASES)
     
-    for i, test in enumerate(test_cases, 1):
-        print(f"\nTest {i}/{len(test_cases)}: {test['name']}")
+    def run_case(i, test):
+        print(f"\nTest {i}/{len(_SUITE_CASES)}: {test['name']}")
         print(f"Expected: {test['expected']}")
         print()
         
-        session_id = test.get('session_id') or f"test-suite-{i}-{uuid.uuid4()}"
+        session_id = test.get('session_id') or f"test-suite-{i}-{uuid.uuid4().hex}"
         
         result = test_agent(
             runtime_arn=runtime_arn,
@@ -134,42 +151,84 @@ def run_test_suite(runtime_arn: str):
             actor_id="test-suite-actor"
         )
         
-        results.append({
-            "test": test['name'],
-            "success": result is not None,
-            "response": result
-        })
-        
         print()
+        return result
+    
+    sys.stdout = ThreadBufferedStdout()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(_SUITE_CASES), max_parallel))) as executor:
+            futures = {
+                executor.submit(run_buffered, run_case, i, test): i
+                for i, test in enumerate(_SUITE_CASES, 1)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                result, output = future.result()
+                sys.__stdout__.write(output)
+                # Only the outcome is kept; the response was already printed
+                results[i - 1] = {
+                    "test": _SUITE_CASES[i - 1]['name'],
+                    "success": result is not None
+                }
+    finally:
+        sys.stdout = sys.__stdout__
     
     # Summary
-    print("=" * 60)
+    print(BAR)
     print("📊 Test Summary")
-    print("=" * 60)
+    print(BAR)
     
-    passed = sum(1 for r in results if r['success'])
-    total = len(results)
+    statuses = list(map(_get_success, results))
+    passed = sum(statuses)
+    total = len(statuses)
     
-    for result in results:
-        status = "✅ PASS" if result['success'] else "❌ FAIL"
-        print(f"{status} - {result['test']}")
+    print("\n".join(
+        f"{'✅ PASS' if ok else '❌ FAIL'} - {result['test']}"
+        for ok, result in zip(statuses, results)
+    ))
     
     print()
     print(f"Results: {passed}/{total} tests passed")
-    print("=" * 60)
+    print(BAR)
     
     return passed == total
 
 
-def test_memory_continuity(runtime_arn: str):
-    """Test short-term memory persistence across multiple messages in the same session."""
+def test_memory_continuity(runtime_arn: str, concurrency: int = 1):
+    """
+    Test short-term memory persistence across multiple messages in the same session.
+    
+    With concurrency > 1, that many independent sessions run in parallel on the
+    shared client; messages within each session are still sent in order.
+    """
+    if concurrency <= 1:
+        return _run_memory_session(runtime_arn)
+    
+    outcomes = []
+    sys.stdout = ThreadBufferedStdout()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(run_buffered, _run_memory_session, runtime_arn) for _ in range(concurrency)]
+            for future in as_completed(futures):
+                passed, output = future.result()
+                sys.__stdout__.write(output)
+                outcomes.append(passed)
+    finally:
+        sys.stdout = sys.__stdout__
+    
+    print(f"🧠 {sum(outcomes)}/{concurrency} memory sessions passed")
+    return all(outcomes)
+
+
+def _run_memory_session(runtime_arn: str):
+    """Send the memory test sequence within one new session."""
     
     print("🧠 Testing Memory Continuity")
-    print("=" * 60)
+    print(BAR)
     print()
     
     # Use a consistent session ID for memory testing
-    memory_session_id = f"memory-test-{uuid.uuid4()}"
+    memory_session_id = "memory-test-" + uuid.uuid4().hex
     actor_id = "memory-test-actor"
     
     test_sequence = [
@@ -205,25 +264,27 @@ def test_memory_continuity(runtime_arn: str):
             actor_id=actor_id
         )
         
+        # Only the outcome is kept; the response was already printed
         results.append({
             "message": test['prompt'],
-            "success": result is not None,
-            "response": result
+            "success": result is not None
         })
         
         print()
     
     # Summary
-    print("=" * 60)
+    print(BAR)
     print("🧠 Memory Test Summary")
-    print("=" * 60)
+    print(BAR)
     
-    passed = sum(1 for r in results if r['success'])
-    total = len(results)
+    statuses = list(map(_get_success, results))
+    passed = sum(statuses)
+    total = len(statuses)
     
-    for i, result in enumerate(results, 1):
-        status = "✅" if result['success'] else "❌"
-        print(f"{status} Message {i}: {result['message'][:50]}...")
+    print("\n".join(
+        f"{'✅' if ok else '❌'} Message {i}: {result['message'][:50]}..."
+        for i, (ok, result) in enumerate(zip(statuses, results), 1)
+    ))
     
     print()
     print(f"Results: {passed}/{total} messages successfully processed")
@@ -234,44 +295,58 @@ def test_memory_continuity(runtime_arn: str):
     else:
         print("❌ Memory continuity test FAILED")
     
-    print("=" * 60)
+    print(BAR)
     
     return passed == total
 
 
+# Built once at import; main() only parses
+_PARSER = argparse.ArgumentParser(
+    description="Test LangGraphAgentCore on AWS Bedrock Agent Core Runtime"
+)
+_PARSER.add_argument(
+    'runtime_arn',
+    help='ARN of the AgentCore Runtime (e.g., arn:aws:bedrock-agentcore:us-west-2:...)'
+)
+_PARSER.add_argument(
+    '--prompt',
+    default=None,
+    help='Custom prompt to test (if not provided, runs full test suite)'
+)
+_PARSER.add_argument(
+    '--session-id',
+    help='Session ID for conversation continuity'
+)
+_PARSER.add_argument(
+    '--actor-id',
+    help='Actor ID for user/agent identification'
+)
+_PARSER.add_argument(
+    '--test-suite',
+    action='store_true',
+    help='Run full test suite'
+)
+_PARSER.add_argument(
+    '--test-memory',
+    action='store_true',
+    help='Run memory continuity test'
+)
+_PARSER.add_argument(
+    '--concurrency',
+    type=int,
+    default=1,
+    help='Memory test sessions to run in parallel (default: 1)'
+)
+_PARSER.add_argument(
+    '--max-parallel',
+    type=int,
+    default=5,
+    help='Maximum test suite cases to run concurrently (default: 5)'
+)
+
+
 def main():
-    parser = argparse.ArgumentParser(
-        description="Test LangGraphAgentCore on AWS Bedrock Agent Core Runtime"
-    )
-    parser.add_argument(
-        'runtime_arn',
-        help='ARN of the AgentCore Runtime (e.g., arn:aws:bedrock-agentcore:us-west-2:...)'
-    )
-    parser.add_argument(
-        '--prompt',
-        default=None,
-        help='Custom prompt to test (if not provided, runs full test suite)'
-    )
-    parser.add_argument(
-        '--session-id',
-        help='Session ID for conversation continuity'
-    )
-    parser.add_argument(
-        '--actor-id',
-        help='Actor ID for user/agent identification'
-    )
-    parser.add_argument(
-        '--test-suite',
-        action='store_true',
-        help='Run full test suite'
-    )
-    parser.add_argument(
-        '--test-memory',
-        action='store_true',
-        help='Run memory continuity test'
-    )
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     # Validate runtime ARN format
     if not args.runtime_arn.startswith('arn:aws:bedrock-agentcore:'):
@@ -279,13 +354,16 @@ def main():
         print("Expected format: arn:aws:bedrock-agentcore:REGION:ACCOUNT:agent-runtime/ID")
         sys.exit(1)
     
+    # Build the client up front so every test reuses its connection pool
+    client = agentcore_client(REGION)
+    
     if args.test_memory:
         # Run memory continuity test
-        success = test_memory_continuity(args.runtime_arn)
+        success = test_memory_continuity(args.runtime_arn, concurrency=args.concurrency)
         sys.exit(0 if success else 1)
     elif args.test_suite or not args.prompt:
         # Run test suite
-        success = run_test_suite(args.runtime_arn)
+        success = run_test_suite(args.runtime_arn, max_parallel=args.max_parallel)
         sys.exit(0 if success else 1)
     else:
         # Single prompt test
@@ -293,7 +371,8 @@ def main():
             runtime_arn=args.runtime_arn,
             prompt=args.prompt,
             session_id=args.session_id,
-            actor_id=args.actor_id
+            actor_id=args.actor_id,
+            client=client
         )
         sys.exit(0 if result else 1)
 